@@ -1,5 +1,7 @@
 import random
-from typing import List, Optional, Tuple
+from collections import deque
+from itertools import islice
+from typing import Container, Deque, List, Optional, Set, Tuple
 
 import pygame
 
@@ -12,12 +14,30 @@ GRID_SIZE = 20
 GRID_WIDTH = SCREEN_WIDTH // GRID_SIZE
 GRID_HEIGHT = SCREEN_HEIGHT // GRID_SIZE
 
+# Все ячейки поля (левый верхний угол каждой):
+ALL_CELLS = tuple((x * GRID_SIZE, y * GRID_SIZE)
+                  for x in range(GRID_WIDTH) for y in range(GRID_HEIGHT))
+
+# Сколько раз пробовать случайная ячейка для яблока до полного перебора:
+APPLE_SPAWN_ATTEMPTS = 16
+
 # Направления движения:
 UP = (0, -1)
 DOWN = (0, 1)
 LEFT = (-1, 0)
 RIGHT = (1, 0)
 
+# Противоположное направление для каждого направления:
+OPPOSITE_DIRECTIONS = {UP: DOWN, DOWN: UP, LEFT: RIGHT, RIGHT: LEFT}
+
+# Направление движения для каждой клавиши-стрелки:
+KEY_DIRECTIONS = {
+    pygame.K_UP: UP,
+    pygame.K_DOWN: DOWN,
+    pygame.K_LEFT: LEFT,
+    pygame.K_RIGHT: RIGHT,
+}
+
 # Цвет фона - черный:
 BOARD_BACKGROUND_COLOR = (0, 0, 0)
 
@@ -33,73 +53,126 @@ SNAKE_COLOR = (0, 255, 0)
 # Скорость движения змейки:
 SPEED = 20
 
+# Частота кадров и интервал между шагами змейки в миллисекундах:
+FPS = 60
+MOVE_INTERVAL = 1000 // SPEED
+
+# Сколько пропущенных шагов можно догнать за один кадр после задержки:
+MAX_CATCH_UP_STEPS = 2
+
 # Настройка игрового окна:
 screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), 0, 32)
 
 # Заголовок окна игрового поля:
 pygame.display.set_caption('Змейка')
 
+# События, после которых окно нужно перерисовать целиком:
+EXPOSE_EVENTS = (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED)
+
+# В очередь попадают только нужные игре события:
+pygame.event.set_blocked(None)
+pygame.event.set_allowed([pygame.QUIT, pygame.KEYDOWN, *EXPOSE_EVENTS])
+
 # Настройка времени:
 clock = pygame.time.Clock()
 
 
+def make_cell_surface(color: Tuple[int, int, int]) -> pygame.Surface:
+    """Заранее рисует одна ячейка заданного цвета с границей."""
+    cell = pygame.Surface((GRID_SIZE, GRID_SIZE))
+    cell.fill(color)
+    pygame.draw.rect(cell, BORDER_COLOR, cell.get_rect(), 1)
+    # Формат пикселей как у экрана, чтобы blit копировал без преобразования.
+    return cell.convert()
+
+
 class GameObject:
     """Экран обьекта"""
 
+    __slots__ = ('position', 'body_color', 'cell_surface')
+
     def __init__(self, position: Optional[Tuple[int, int]] = None,
                  body_color: Optional[Tuple[int, int, int]] = None) -> None:
         """Инициализация объект на игры поле."""
         self.position = position or (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
         self.body_color = body_color or (255, 255, 255)
+        # Готовая ячейка, чтобы не рисовать прямоугольники каждый кадр:
+        self.cell_surface = make_cell_surface(self.body_color)
 
-    def draw(self, surface: pygame.Surface) -> None:
-        """Абстрактный метод для отрисовки объект на экран."""
-        pass
+    def draw(self, surface: pygame.Surface) -> List[pygame.Rect]:
+        """Абстрактный метод для отрисовки объект на экран.
 
-    def draw_cell(self, surface: pygame.Surface, position: Tuple[int, int],
-                  color: Optional[Tuple[int, int, int]] = None) -> None:
+        Возвращает изменённые прямоугольники экрана.
+        """
+        return []
+
+    def draw_cell(self, surface: pygame.Surface,
+                  position: Tuple[int, int]) -> pygame.Rect:
         """Отрисовывает ячейка на экран."""
-        rect = pygame.Rect(position, (GRID_SIZE, GRID_SIZE))
-        pygame.draw.rect(surface, color or self.body_color, rect)
-        pygame.draw.rect(surface, BORDER_COLOR, rect, 1)
+        return surface.blit(self.cell_surface, position)
 
 
 class Apple(GameObject):
     """Яблоко"""
 
+    __slots__ = ()
+
     def __init__(self) -> None:
         """Инициализирует яблоко на игры поле."""
         super().__init__(None, APPLE_COLOR)
         self.randomize_position()
 
-    def randomize_position(self) -> None:
-        """Установка случайное положение яблоко на игры поле."""
-        self.position = (random.randint(0, GRID_WIDTH - 1) * GRID_SIZE,
-                         random.randint(0, GRID_HEIGHT - 1) * GRID_SIZE)
+    def randomize_position(
+            self, occupied: Container[Tuple[int, int]] = ()) -> None:
+        """Установка случайное положение яблоко на игры поле.
 
-    def draw(self, surface: pygame.Surface) -> None:
+        Яблоко не попадает в занятые клетки occupied.
+        Если свободных ячеек нет, позиция не меняется.
+        """
+        for _ in range(APPLE_SPAWN_ATTEMPTS):
+            position = (random.randint(0, GRID_WIDTH - 1) * GRID_SIZE,
+                        random.randint(0, GRID_HEIGHT - 1) * GRID_SIZE)
+            if position not in occupied:
+                self.position = position
+                return
+
+        # Поле почти заполнено: выбираем из оставшихся свободных ячеек.
+        free_cells = [cell for cell in ALL_CELLS if cell not in occupied]
+        if free_cells:
+            self.position = random.choice(free_cells)
+
+    def draw(self, surface: pygame.Surface) -> List[pygame.Rect]:
         """Отрисовывает яблоко на игры поверхности."""
-        self.draw_cell(surface, self.position)
+        return [self.draw_cell(surface, self.position)]
 
 
 class Snake(GameObject):
     """Змейка."""
 
+    __slots__ = ('length', 'positions', '_body_set', 'direction',
+                 'next_direction', 'vacated', 'new_heads')
+
     def __init__(self) -> None:
         """Инициализирует начале состояние змейка."""
         super().__init__((GRID_WIDTH // 2 * GRID_SIZE,
                           GRID_HEIGHT // 2 * GRID_SIZE), SNAKE_COLOR)
         self.length: int = 1
-        self.positions: List[Tuple[int, int]] = [self.position]
+        self.positions: Deque[Tuple[int, int]] = deque(
+            [self.position], maxlen=self.length)
+        self._body_set: Set[Tuple[int, int]] = {self.position}
         self.direction: Tuple[int, int] = RIGHT
         self.next_direction: Optional[Tuple[int, int]] = None
+        self.vacated: List[Tuple[int, int]] = []
+        self.new_heads: int = 1
 
     def update_direction(self, new_direction: Tuple[int, int]) -> None:
         """Обновляет направление движения змейка."""
-        if new_direction != (self.direction[0] * -1, self.direction[1] * -1):
+        if new_direction != OPPOSITE_DIRECTIONS[self.direction]:
             self.next_direction = new_direction
 
-    def move(self) -> None:
+    def move(self, _grid_size: int = GRID_SIZE,
+             _screen_width: int = SCREEN_WIDTH,
+             _screen_height: int = SCREEN_HEIGHT) -> None:
         """
         Обновляет позиция змейка и ещё добавь на новую голову
         и удалить последний сегмент, а то если длина не увеличилась.
@@ -110,23 +183,62 @@ class Snake(GameObject):
 
         cur_head = self.positions[0]
         x, y = self.direction
-        new_head = ((cur_head[0] + (x * GRID_SIZE)) % SCREEN_WIDTH,
-                    (cur_head[1] + (y * GRID_SIZE)) % SCREEN_HEIGHT)
-
-        if len(self.positions) > 2 and new_head in self.positions[2:]:
+        # Шаг ровно на одну ячейку, поэтому для перехода через край
+        # достаточно одного сложения или вычитания вместо остатка.
+        new_x = cur_head[0] + x * _grid_size
+        if new_x < 0:
+            new_x += _screen_width
+        elif new_x >= _screen_width:
+            new_x -= _screen_width
+        new_y = cur_head[1] + y * _grid_size
+        if new_y < 0:
+            new_y += _screen_height
+        elif new_y >= _screen_height:
+            new_y -= _screen_height
+        new_head = (new_x, new_y)
+
+        # Хвост освободит клетку, если змейка не растёт на этом ходу:
+        # deque с maxlen сам вытеснит его при appendleft.
+        tail_moves = len(self.positions) == self.positions.maxlen
+        if new_head in self._body_set and not (
+                tail_moves and new_head == self.positions[-1]):
             self.reset()
         else:
-            self.positions.insert(0, new_head)
-            if len(self.positions) > self.length:
-                self.positions.pop()
-
-    def draw(self, surface: pygame.Surface) -> None:
-        """Отрисовывает змейка на экране затирая след."""
-        for position in self.positions[:-1]:
-            self.draw_cell(surface, position)
-
-        head_position = self.positions[0]
-        self.draw_cell(surface, head_position, SNAKE_COLOR)
+            if tail_moves:
+                self.vacated.append(self.positions[-1])
+                self._body_set.discard(self.positions[-1])
+            self.positions.appendleft(new_head)
+            self._body_set.add(new_head)
+            self.new_heads += 1
+
+    def grow(self) -> None:
+        """Увеличивает длина змейка на один сегмент."""
+        self.length += 1
+        self.positions = deque(self.positions, maxlen=self.length)
+
+    def draw(self, surface: pygame.Surface) -> List[pygame.Rect]:
+        """Отрисовывает змейка на экране затирая след.
+
+        Рисуются только головы, появившиеся после прошлой отрисовки,
+        остальные сегменты уже на экране.
+        """
+        dirty = [
+            surface.fill(BOARD_BACKGROUND_COLOR,
+                         (position[0], position[1], GRID_SIZE, GRID_SIZE))
+            for position in self.vacated
+        ]
+        self.vacated.clear()
+
+        heads = islice(self.positions, self.new_heads)
+        dirty += surface.blits(
+            [(self.cell_surface, head) for head in heads])
+        self.new_heads = 0
+        return dirty
+
+    @property
+    def occupied(self) -> Set[Tuple[int, int]]:
+        """Множество клеток, занятых змейка."""
+        return self._body_set
 
     def get_head_position(self) -> Tuple[int, int]:
         """
@@ -140,49 +252,83 @@ class Snake(GameObject):
         Сбрасывает змейка в начале состояние
         и после столкновение с собой снова игры.
         """
+        self.vacated.extend(self.positions)
         self.length = 1
-        self.positions = [self.position]
+        self.positions = deque([self.position], maxlen=self.length)
+        self._body_set = {self.position}
         self.direction = RIGHT
         self.next_direction = None
+        self.new_heads = 1
+
 
+def handle_keys(snake: Snake) -> bool:
+    """Обрабатывает клавиш, чтобы работает движения змейка.
 
-def handle_keys(snake: Snake) -> None:
-    """Обрабатывает клавиш, чтобы работает движения змейка."""
+    Возвращает True, если окно нужно перерисовать целиком.
+    """
+    exposed = False
     for event in pygame.event.get():
         if event.type == pygame.QUIT:
             pygame.quit()
             raise SystemExit
-        elif event.type == pygame.KEYDOWN:
-            if event.key == pygame.K_UP:
-                snake.update_direction(UP)
-            elif event.key == pygame.K_DOWN:
-                snake.update_direction(DOWN)
-            elif event.key == pygame.K_LEFT:
-                snake.update_direction(LEFT)
-            elif event.key == pygame.K_RIGHT:
-                snake.update_direction(RIGHT)
+        elif event.type == pygame.KEYDOWN and event.key in KEY_DIRECTIONS:
+            snake.update_direction(KEY_DIRECTIONS[event.key])
+        elif event.type in EXPOSE_EVENTS:
+            exposed = True
+    return exposed
+
+
+def redraw_screen(snake: Snake, apple: Apple) -> None:
+    """Полностью перерисовывает игровое поле и обновляет весь экран."""
+    screen.fill(BOARD_BACKGROUND_COLOR)
+    # Стёртые клетки уже закрашены фоном, рисуем змейка целиком.
+    snake.vacated.clear()
+    snake.new_heads = len(snake.positions)
+    snake.draw(screen)
+    apple.draw(screen)
+    pygame.display.update()
 
 
 def main() -> None:
     """функция выполнения игры цикл."""
     snake = Snake()
     apple = Apple()
+    apple.randomize_position(snake.occupied)
 
-    while True:
-        clock.tick(SPEED)
-
-        handle_keys(snake)
-        snake.move()
+    # Полная отрисовка только в начале и когда окно открыто заново,
+    # в остальное время обновляются только изменённые клетки.
+    redraw_screen(snake, apple)
 
-        if snake.get_head_position() == apple.position:
-            snake.length += 1
-            apple.randomize_position()
-
-        screen.fill(BOARD_BACKGROUND_COLOR)
-        snake.draw(screen)
-        apple.draw(screen)
-
-        pygame.display.update()
+    # Логика идёт фиксированными шагами, независимо от частоты кадров.
+    elapsed = 0
+    while True:
+        # После долгой задержки не отыгрываем все пропущенные шаги разом,
+        # иначе змейка прыгнет на много клеток без управления.
+        elapsed = min(elapsed + clock.tick(FPS),
+                      MOVE_INTERVAL * MAX_CATCH_UP_STEPS)
+
+        exposed = handle_keys(snake)
+        apple_moved = False
+        while elapsed >= MOVE_INTERVAL:
+            elapsed -= MOVE_INTERVAL
+            snake.move()
+
+            if snake.get_head_position() == apple.position:
+                snake.grow()
+                apple.randomize_position(snake.occupied)
+                apple_moved = True
+
+        if exposed:
+            redraw_screen(snake, apple)
+            continue
+
+        # Все шаги за кадр рисуются одним пакетом, яблоко - поверх
+        # затёртых змейка клеток.
+        dirty = snake.draw(screen)
+        if apple_moved:
+            dirty += apple.draw(screen)
+        if dirty:
+            pygame.display.update(dirty)
 
 
 if __name__ == '__main__':